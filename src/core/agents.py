@@ -40,7 +40,7 @@ class RetrievalAgent(BaseAgent):
   def get_messages(
     self,
     configuration: Configuration,
-    thread_id: int
+    thread_id: int | str
   ) -> list[AnyMessage]:
     config = {"configurable": configuration.asdict() | {"thread_id": str(thread_id)}}
     graph_state = self._graph.get_state(config=config) # Output of get_state is a snapshot state tuple
@@ -52,7 +52,7 @@ class RetrievalAgent(BaseAgent):
     self,
     query: str,
     configuration: Configuration,
-    thread_id: int
+    thread_id: int | str
   ) -> str | Any:
     """
     Stream the retrieval graph with a query and thread ID.
@@ -61,7 +61,7 @@ class RetrievalAgent(BaseAgent):
       query (str): The query to process.
       configuration (Configuration(dataclass)): The configuration holding the
         models, host url and other parameters.
-      thread_id (int): The ID of the thread for context.
+      thread_id (int | str): The ID of the thread for context.
 
     Yields:
       str | Any: Message chunks of the 'response' node.
@@ -5,7 +5,9 @@
 from __future__ import annotations
 
 import json
+import time
 from dataclasses import dataclass, field, fields
+from functools import cache
 from typing import Optional, Type, TypeVar, Literal
 from pathlib import Path
 
@@ -23,6 +25,12 @@ logger = get_logger(__name__)
 CONFIG_PATH =  Path("./user_data/configuration.json")
 
 
+@cache
+def _init_field_names(cls: type) -> frozenset[str]:
+  """Names of the init fields of a dataclass, reflected once per class."""
+  return frozenset(f.name for f in fields(cls) if f.init)
+
+
 @dataclass(kw_only=True)
 class Configuration:
   """Configuration class for indexing and retrieval operations.
@@ -100,7 +108,7 @@ class Configuration:
     """
     config = ensure_config(config)
     configurable = config.get("configurable") or {}
-    _fields = {f.name for f in fields(cls) if f.init}
+    _fields = _init_field_names(cls)
     return cls(**{k: v for k, v in configurable.items() if k in _fields})
 
 
@@ -115,9 +123,22 @@ def _is_ollama_client_available(url: str) -> bool:
   except requests.RequestException:
     return False
 
+# Seconds during which a probe result is reused, long enough to cover the
+# pages of a new session, short enough to notice the server going up or down
+_PROBE_TTL = 10
+_probes: dict[str, tuple[float, bool]] = {}
+
+def _is_ollama_client_available_cached(url: str) -> bool:
+  """`_is_ollama_client_available`, reusing a result for `_PROBE_TTL` seconds."""
+  now = time.monotonic()
+  probe = _probes.get(url)
+  if probe is None or now - probe[0] > _PROBE_TTL:
+    probe = _probes[url] = (now, _is_ollama_client_available(url))
+  return probe[1]
+
 def load_config(cls: Optional[Type[T]] = Configuration) -> T:
   config = cls()
-  if _is_ollama_client_available(OLLAMA_CLIENT):
+  if _is_ollama_client_available_cached(OLLAMA_CLIENT):
     logger.info(f"{OLLAMA_CLIENT} available")
     config.ollama_host = OLLAMA_CLIENT
   return config
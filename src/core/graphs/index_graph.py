@@ -2,6 +2,7 @@ from utils.logging import get_logger
 # Configure logger
 logger = get_logger(__name__)
 
+from functools import cache
 from typing import Optional
 from pathlib import Path
 from tqdm import tqdm
@@ -14,7 +15,7 @@ from core import retrieval
 from core.configuration import Configuration
 from core.states import IndexState, InputIndexState
 from core.models import load_embedding_model
-from utils.utils import remove_duplicates, make_batch
+from utils.utils import remove_duplicates, make_batch, count_batches
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 #from langchain_experimental.text_splitter import SemanticChunker
@@ -133,7 +134,7 @@ def index_docs(
     
     # Prepare document batches
     documents_batch = make_batch(obj=state.docs, size= 20)
-    total_batches = len(documents_batch)
+    total_batches = count_batches(len(state.docs), size= 20)
     total_documents = len(state.docs)
     
     logger.info(f"Processing {total_documents} documents in {total_batches} batches")
@@ -143,7 +144,7 @@ def index_docs(
       embedding_model=load_embedding_model(model=configuration.embedding_model)
     ) as retriever:
       
-      for i, batch in enumerate(tqdm(documents_batch, desc="Adding document batch..."), 1):
+      for i, batch in enumerate(tqdm(documents_batch, desc="Adding document batch...", total=total_batches), 1):
         try:
           retriever.add_documents(batch)
           logger.debug(f"Successfully indexed batch {i}/{total_batches} ({len(batch)} documents)")
@@ -175,6 +176,7 @@ def should_index(state: IndexState, *, config: RunnableConfig) -> str:
 ######################################## Graph compiler ########################################
 
 
+@cache # Shared by all sessions, each run only depends on the path it is invoked with
 def get_index_graph() -> CompiledStateGraph:
   
   logger.info("Building document indexing graph")
@@ -36,6 +36,7 @@ from utils.logging import get_logger
 # Initialize retrievalAgentLogger
 logger = get_logger(__name__)
 
+from functools import cache
 from pydantic import BaseModel
 from typing import cast, Any
 
@@ -441,6 +442,7 @@ def should_continue(state: ReportState, *, config: RunnableConfig):
 ######################################## Graph compiler ########################################
 
 
+@cache # Shared by all sessions, compiled without a checkpointer so reports keep no state
 def get_report_graph() -> CompiledStateGraph:
   
   logger.info("Building report generation graph")
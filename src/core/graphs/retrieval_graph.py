@@ -15,7 +15,7 @@ from typing import cast, Dict, List, Union
 from pydantic import BaseModel
 
 from langchain_core.documents import Document
-from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
 
 from langgraph.graph import StateGraph, END
@@ -233,7 +233,6 @@ def respond(
     logger.error(f"Error in respond: {str(e)}")
     # Create a fallback response
     try:
-      from langchain_core.messages import AIMessage
       fallback_response = AIMessage(content="""I apologize, but I encountered an error while generating a response. Please try rephrasing your question.""")
       logger.warning("Using fallback response due to error")
       return {
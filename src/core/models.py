@@ -1,11 +1,18 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from utils.logging import get_logger
 
+# Only used for annotations, importing langchain at runtime is slow
+if TYPE_CHECKING:
+  from langchain_core.embeddings import Embeddings
+  from langchain_core.language_models import BaseChatModel
+
 modelLogger = get_logger(__name__)
 
 ######################################## Embedding model ########################################
 
-from langchain.embeddings.base import Embeddings
-
 def load_embedding_model(
     model: str,
     host: str = None   #"http://localhost:11434"
@@ -18,8 +25,6 @@ def load_embedding_model(
 
 ######################################## Chat model ########################################
 
-from langchain.chat_models.base import BaseChatModel
-
 def load_chat_model(
     model: str,
     host: str = None #"http://localhost:11434"
@@ -1,12 +1,12 @@
 import subprocess
 
 from constant import UPLOAD_DIR, VECTORSTORE_DIR
-from utils.utils import ensure_path
+from utils.utils import ensure_dir
 
 
 # Ensure necessary directories exist
-ensure_path(path_str = UPLOAD_DIR)
-ensure_path(path_str = VECTORSTORE_DIR)
+ensure_dir(path_str = UPLOAD_DIR)
+ensure_dir(path_str = VECTORSTORE_DIR)
 
 import os
 os.environ['ANONYMIZED_TELEMETRY'] = 'False' # Disable Chromadb telemetry
@@ -1,5 +1,4 @@
 import streamlit as st
-import ollama
 
 from core.configuration import load_config
 from constant import OLLAMA_CLIENT
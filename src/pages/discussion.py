@@ -6,13 +6,16 @@ of AI responses, including separate display of thinking processes and final answ
 The interface allows users to configure server connections and model settings.
 """
 
+import time
+from uuid import uuid4
+
 import streamlit as st
 
 from utils.utils import extract_think_and_answer
 from pages.utils import is_ollama_client_available, is_connected
 from core.agents import RetrievalAgent
 from core.configuration import load_config
-from constant import OLLAMA_LOCALHOST
+from constant import OLLAMA_CLIENT, OLLAMA_LOCALHOST
 
 
 ############################## Initialization ##############################
@@ -28,10 +31,19 @@ if "baseConfig" not in st.session_state:
 if "retrievalAgent" not in st.session_state:
   st.session_state.retrievalAgent = RetrievalAgent() # Instantiate the retrieval agent
 if "ollama_host" not in st.session_state:
-  from constant import OLLAMA_CLIENT
   st.session_state.ollama_host = OLLAMA_CLIENT
+if "thread_id" not in st.session_state:
+  st.session_state.thread_id = str(uuid4()) # One discussion thread per session
+
+_RENDER_INTERVAL = 1 / 30 # Seconds between two refreshes of the streamed answer
 
-_THREAD = 1
+# Chat role of each message type, other messages are shown as system messages
+_CHAT_ROLES = {
+  "ai": "ai",
+  "AIMessageChunk": "ai",
+  "human": "human",
+  "HumanMessageChunk": "human",
+}
 
 
 ############################## Private methods ##############################
@@ -49,7 +61,10 @@ def _stream_with_thinking_separation(query: str):
   Args:
     query: The user query to process
   """
-  accumulated_text = ""
+  chunks = [] # Text received so far, only joined when displayed
+  last_text = "" # End of the text received so far
+  thinking = False # Whether a <think> block is open
+  last_render = 0.0
   if (
     st.session_state.baseConfig.response_model == st.session_state.models["server_reasoning"]
     or st.session_state.baseConfig.response_model == st.session_state.models["local_reasoning"]
@@ -62,26 +77,50 @@ def _stream_with_thinking_separation(query: str):
     for chunk in st.session_state.retrievalAgent.stream(
       query=query,
       configuration=st.session_state.baseConfig,
-      thread_id=_THREAD,
+      thread_id=st.session_state.thread_id,
     ):
-      accumulated_text += chunk
+      chunks.append(chunk)
+      # Only the new chunk, plus the end of the previous text for tags split
+      # across chunks, can hold a new tag: no need to rescan the whole buffer
+      tail = last_text + chunk
+      last_text = tail[-7:]
+      tail = tail.lower()
       
       # Check if thinking is complete
-      if "</think>" in accumulated_text.lower():
-        # Extract thinking and reset the accumulated text to get the actual answer
+      if "</think>" in tail:
+        thinking = False
+        # Extract thinking and restart the accumulated text from the actual answer
         # (only one thinking part)
-        thinking_content, accumulated_text = extract_think_and_answer(accumulated_text)
+        thinking_content, answer = extract_think_and_answer("".join(chunks))
+        chunks = [answer]
+        last_text = answer[-7:]
 
         # Show expander with thinking content if it exists
         if thinking_content:
           thinking_placeholder.markdown(thinking_content)
         
         # Start streaming the answer part
-        response_placeholder.markdown(accumulated_text)
-
-      elif "<think>" not in accumulated_text.lower():
-        # No thinking content detected, stream normally
-        response_placeholder.markdown(accumulated_text)
+        response_placeholder.markdown(answer)
+        last_render = time.monotonic()
+
+      elif thinking or "<think>" in tail:
+        # Thinking in progress, wait for the answer
+        if not thinking:
+          # Show the text before the tag, the last refresh may have skipped it
+          response_placeholder.markdown("".join(chunks[:-1]))
+          thinking = True
+
+      else:
+        # No thinking content detected, stream normally. Each markdown call
+        # re-renders the whole answer, so coalesce fast chunks
+        now = time.monotonic()
+        if now - last_render >= _RENDER_INTERVAL:
+          response_placeholder.markdown("".join(chunks))
+          last_render = now
+
+    # Render the chunks received since the last refresh
+    if not thinking:
+      response_placeholder.markdown("".join(chunks))
         
   except Exception as e:
     error_message = f"Error processing query: {str(e)}"
@@ -141,19 +180,17 @@ st.sidebar.write(f"using model {st.session_state.baseConfig.response_model}")
 # Retrieve existing messages
 messages = st.session_state.retrievalAgent.get_messages(
   configuration=st.session_state.baseConfig,
-  thread_id=_THREAD,
+  thread_id=st.session_state.thread_id,
 )
 
 for message in messages:
-  from langchain_core.messages import AIMessage
-  from langchain_core.messages.human import HumanMessage
+  name = _CHAT_ROLES.get(message.type, "system")
   
-  if isinstance(message, AIMessage):
-    name = "ai"
-    # Extract thinking and response content
-    thoughts, answer = extract_think_and_answer(message.content)
-    
-    with st.chat_message(name):
+  with st.chat_message(name):
+    if name == "ai":
+      # Extract thinking and response content
+      thoughts, answer = extract_think_and_answer(message.content)
+      
       # Display thinking content in expander if available
       if thoughts:
         with st.expander("Show thinking"):
@@ -161,13 +198,7 @@ for message in messages:
       # Display the main response
       st.markdown(answer if answer else message.content)
 
-  elif isinstance(message, HumanMessage):
-    name = "human"
-    with st.chat_message(name):
-      st.markdown(message.content)
-  else:
-    name = "system"
-    with st.chat_message(name):
+    else:
       st.markdown(message.content)
 
 
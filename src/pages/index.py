@@ -6,7 +6,7 @@ from pathlib import Path
 from core.configuration import load_config
 from core.agents import IndexAgent
 from core.retrieval import delete_documents, get_existing_documents
-from constant import UPLOAD_DIR, OLLAMA_LOCALHOST
+from constant import UPLOAD_DIR, OLLAMA_CLIENT, OLLAMA_LOCALHOST
 from core.retrieval import get_existing_documents
 from pages.utils import is_ollama_client_available, is_connected
 
@@ -27,7 +27,6 @@ if "baseConfig" not in st.session_state:
 if "indexAgent" not in st.session_state:
   st.session_state.indexAgent = IndexAgent()
 if "ollama_host" not in st.session_state:
-  from constant import OLLAMA_CLIENT
   st.session_state.ollama_host = OLLAMA_CLIENT
 
 st.markdown("# Documents")
@@ -14,9 +14,8 @@ from datetime import datetime
 
 from core.agents import ReportAgent
 from core.configuration import load_config
-from utils.converter import dict_to_pdf
 from pages.utils import is_ollama_client_available, is_connected
-from constant import OUTPUT_DIR, OLLAMA_LOCALHOST
+from constant import OUTPUT_DIR, OLLAMA_CLIENT, OLLAMA_LOCALHOST
 
 
 ################################ Initialization ###############################
@@ -34,7 +33,6 @@ if "reportAgent" not in st.session_state:
 if "report_history" not in st.session_state:
   st.session_state.report_history = []
 if "ollama_host" not in st.session_state:
-  from constant import OLLAMA_CLIENT
   st.session_state.ollama_host = OLLAMA_CLIENT
   
 
@@ -47,9 +45,6 @@ def _create_report(query:str):
   filename = f"report_{timestamp}.pdf"
   output_path = Path(OUTPUT_DIR) / filename
   
-  # Ensure output directory exists
-  Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
-  
   # Generate the report
   output, header = st.session_state.reportAgent.invoke(
     query=query,
@@ -59,6 +54,7 @@ def _create_report(query:str):
   if output and header:
     
     # Generate PDF
+    from utils.converter import dict_to_pdf # reportlab is only needed here
     with st.spinner("Creating PDF..."):
       pdf_path = dict_to_pdf(
         data = output,
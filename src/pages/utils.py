@@ -40,8 +40,6 @@ def is_connected(session_state: SessionStateProxy) -> bool:
 ############################# List ollama models ##############################
 
 
-import ollama
-
 def list_ollama_models(base_url = None) -> list:
   """
   List all models available on the Ollama client.
@@ -52,6 +50,7 @@ def list_ollama_models(base_url = None) -> list:
     e.g. [(model='gemma3:1b' modified_at=... digest=... size=...
     details=ModelDetails(parent_model='', format='gguf', family='gemma3'...))]
   """
+  import ollama
   try:
     client = ollama.Client(host=base_url)
     models = client.list().models
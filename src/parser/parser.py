@@ -1,4 +1,5 @@
 import fitz
+import json
 from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass
@@ -246,7 +247,6 @@ class PDFToMarkdownPipeline:
     self.logger.debug(f"Saved combined document to {combined_file}")
     
     # Save metadata
-    import json
     metadata_file = output_path / "conversion_metadata.json"
     
     with open(metadata_file, 'w') as f:
@@ -5,7 +5,8 @@ import streamlit as st
 
 
 from utils.logging import setup_logging
-from constant import LOG_LEVEL
+from core.configuration import load_config
+from constant import LOG_LEVEL, OLLAMA_CLIENT
 setup_logging(LOG_LEVEL)  # or "DEBUG" for more detailed logs
 
 # Default values of the models for server/local execution and classic/reasoning
@@ -17,10 +18,8 @@ DEFAULT_MODELS = {
 } # This is awful, need persistent configuration better deletion
 
 if "baseConfig" not in st.session_state:
-  from core.configuration import load_config
   st.session_state.baseConfig = load_config()
 if "ollama_host" not in st.session_state:
-  from constant import OLLAMA_CLIENT
   st.session_state.ollama_host = OLLAMA_CLIENT # Loaded in session_state to 
    # allow users to modify it from the config.py page
 if "models" not in st.session_state:
@@ -14,7 +14,7 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
 from reportlab.lib.colors import HexColor
 import re
-from typing import List, Dict, Literal
+from typing import List, Dict, Literal, Optional
 import os
 
 
@@ -57,6 +57,26 @@ _IGNORED_TOKENS = [
   '<startofturn>',
 ]
 
+# Patterns compiled once at import rather than looked up in the re cache on
+# every call
+_COMPILED_CONVERSIONS = [
+  (re.compile(pattern, flags[0] if flags else 0), replacement)
+  for pattern, replacement, *flags in _CONVERSIONS
+]
+
+_THINK_RE = re.compile(r'<think>.*?</think>', re.DOTALL | re.IGNORECASE)
+
+# Characters required by at least one XML escape or Markdown conversion, text
+# without any of them is returned as is
+_MARKUP_CHARS = "*_`~#[<>&\n"
+
+# Single pass over the text for all the ignored tokens, longest first so a
+# token is never cut by one of its prefixes
+_IGNORED_RE = re.compile('|'.join(
+  re.escape(token)
+  for token in sorted(dict.fromkeys(_IGNORED_TOKENS), key=len, reverse=True)
+))
+
 
 ################################ Converter class ##############################
 
@@ -64,11 +84,14 @@ _IGNORED_TOKENS = [
 class MarkdownToPDF:
   """Convert list of dictionaries with Markdown content to PDF."""
   
-  
+  # Paragraph styles shared by all converters, built on first use
+  _styles: Optional[Dict[str, ParagraphStyle]] = None
 
   def __init__(self, page_size=letter):
     self.page_size = page_size
-    self.styles = self._create_styles()
+    if MarkdownToPDF._styles is None:
+      MarkdownToPDF._styles = self._create_styles()
+    self.styles = MarkdownToPDF._styles
   
   def _create_styles(self) -> Dict[str, ParagraphStyle]:
     """Create custom paragraph styles."""
@@ -101,18 +124,12 @@ class MarkdownToPDF:
     if not text:
       return text
 
-    for token in _IGNORED_TOKENS:
-      text = text.replace(token, '')
-
-    return text.strip()
+    return _IGNORED_RE.sub('', text).strip()
 
   def _clean_think_tags(self, text: str) -> str:
     #In case the agent is running a reasoning model
     """Remove <think>...</think> blocks from text."""
-    return re.sub(pattern=r'<think>.*?</think>',
-            repl='',
-            string=text,
-            flags=re.DOTALL | re.IGNORECASE).strip()
+    return _THINK_RE.sub('', text).strip()
   
   def _markdown_to_reportlab(self, text: str) -> str:
     """Convert Markdown to ReportLab markup."""
@@ -124,15 +141,18 @@ class MarkdownToPDF:
 
     # Remove <think> tags first
     text = self._clean_think_tags(text)
+
+    # Plain text, nothing to escape or convert
+    if not any(c in text for c in _MARKUP_CHARS):
+      return text
     
     # Escape XML characters
     text = (text.replace('&', '&amp;')
            .replace('<', '&lt;')
            .replace('>', '&gt;'))
     
-    for pattern, replacement, *flags in _CONVERSIONS:
-      flag = flags[0] if flags else 0
-      text = re.sub(pattern, replacement, text, flags=flag)
+    for pattern, replacement in _COMPILED_CONVERSIONS:
+      text = pattern.sub(replacement, text)
     
     return text
   
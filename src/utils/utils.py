@@ -1,5 +1,16 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from constant import *
 
+# langchain and chromadb are only needed for annotations here, keep them out of
+# the import path of every page
+if TYPE_CHECKING:
+  from chromadb.api import ClientAPI
+  from langchain_core.documents import Document
+  from langchain_core.messages import AnyMessage
+
 #TODO: Improve the format_ functions by turning them into a single function
 
 ############################# connect to database #############################
@@ -8,27 +19,55 @@ from constant import *
 import sqlite3
 
 
+# Applied to every connection when it is opened
+_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=memory;
+PRAGMA cache_size=-64000;
+PRAGMA mmap_size=268435456;
+"""
+
+
 def get_connection() -> sqlite3.Connection:
-  return sqlite3.connect(':memory:', check_same_thread=False)
+  """Open a new connection for a graph checkpointer.
+
+  A `SqliteSaver` keeps the connection it is given for the lifetime of its
+  graph, so each caller gets its own private `:memory:` database, and
+  discussions live as long as the session that holds the graph.
+
+  Returns:
+    sqlite3.Connection: The new connection.
+  """
+  conn = sqlite3.connect(':memory:', check_same_thread=False)
+  conn.executescript(_PRAGMAS)
+  return conn
 
 
 ############################# connect to database #############################
 
 
-from chromadb import PersistentClient
+from functools import cache
 
 
-def get_chroma_client() -> PersistentClient:
+@cache
+def get_chroma_client() -> ClientAPI:
+  """Return the process-wide ChromaDB client for the vectorstore directory."""
+  from chromadb import PersistentClient
   return PersistentClient(path=VECTORSTORE_DIR)
 
 
 ############################### format documents ##############################
 
 
-from langchain_core.documents import Document
 from typing import Optional
 
 
+_EMPTY_DOCS = "<documents></documents>"
+_DOCS_HEADER = "<documents>\n"
+_DOCS_FOOTER = "\n</documents>"
+
+
 def _format_doc(doc: Document) -> str:
   """Format a single document as XML.
 
@@ -75,11 +114,15 @@ def format_docs(docs: Optional[list[Document]]) -> str:
     <documents></documents>
   """
   if not docs:
-    return "<documents></documents>"
-  formatted = "\n".join(_format_doc(doc) for doc in docs)
-  return f"""<documents>
-{formatted}
-</documents>"""
+    return _EMPTY_DOCS
+  # Single join over all the fragments, the separator after the last document
+  # is replaced by the footer
+  parts = [_DOCS_HEADER]
+  for doc in docs:
+    parts.append(_format_doc(doc))
+    parts.append("\n")
+  parts[-1] = _DOCS_FOOTER
+  return "".join(parts)
 
 
 ############################### format messages ###############################
@@ -87,34 +130,74 @@ def format_docs(docs: Optional[list[Document]]) -> str:
 
 import re
 
-from langchain_core.messages import AnyMessage, AIMessage
-from langchain_core.messages.human import HumanMessage
+
+_EMPTY_MESSAGES = "<messages></messages>"
+_MESSAGES_HEADER = "<messages>\n"
+_MESSAGES_FOOTER = "\n</messages>"
+
+# XML tag of each message type, other messages are tagged as "message". Chunks
+# are tagged like the message they are part of.
+_MESSAGE_FLAGS = {
+  "human": "HumanMessage",
+  "HumanMessageChunk": "HumanMessage",
+  "ai": "AIMessage",
+  "AIMessageChunk": "AIMessage",
+}
+
+
+def _strip_think(text: str) -> str:
+  """Remove the <think>...</think> blocks of a string.
+
+  Equivalent to `re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)`
+  but returns the input untouched when it holds no tag, which is the case of
+  every human message and of non reasoning models.
+  """
+  if "<think>" not in text:
+    return text
+  parts = []
+  start = 0
+  while True:
+    open_idx = text.find("<think>", start)
+    if open_idx < 0:
+      break
+    close_idx = text.find("</think>", open_idx + 7)
+    if close_idx < 0:
+      break # Unclosed block, kept as is
+    parts.append(text[start:open_idx])
+    start = close_idx + 8
+  parts.append(text[start:])
+  return "".join(parts)
 
 
 def _format_message(message: AnyMessage) -> str:
-  text = re.sub(r'<think>.*?</think>', '', message.content, flags=re.DOTALL)
-  if isinstance(message, HumanMessage):
-    flag = "HumanMessage"
-  if isinstance(message, AIMessage):
-    flag = "AIMessage"
-  else:
-    flag = "message"
+  # Content may also be a dict or a list of content blocks
+  text = _strip_think(get_message_text(message))
+  flag = _MESSAGE_FLAGS.get(message.type, "message")
   return f"<{flag}>\n{text}\n</{flag}>"
 
 def format_messages(messages: Optional[list[AnyMessage]])-> str:
   if not messages:
-    return "<messages></messages>"
-  formatted = "\n".join(_format_message(message) for message in messages)
-  return f"""<messages>
-{formatted}
-<messages>"""
+    return _EMPTY_MESSAGES
+  parts = [_MESSAGES_HEADER]
+  for message in messages:
+    parts.append(_format_message(message))
+    parts.append("\n")
+  parts[-1] = _MESSAGES_FOOTER
+  return "".join(parts)
 
 ############################### format sources ################################
 
 
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=2048)
+def _stem(path: str) -> str:
+  """Cached `Path(path).stem`, chunks of a same file share their source."""
+  return Path(path).stem
+
+
 def format_sources_markdown(documents: Optional[list[Document]])-> str:
   """
   Convert a list of documents to a markdown list of unique sources.
@@ -129,16 +212,10 @@ def format_sources_markdown(documents: Optional[list[Document]])-> str:
     return "No sources available."
   
   # Extract unique sources
-  sources = set()
-  for document in documents:
-    source = document.metadata.get("source", "unknown")
-    sources.add(source)
+  sources = {document.metadata.get("source", "unknown") for document in documents}
   
   # Sort and format as markdown
-  sorted_sources = sorted(sources)
-  markdown_lines = [f"- {source}" for source in sorted_sources]
-  
-  return "\n".join(markdown_lines)
+  return "\n".join(f"- {source}" for source in sorted(sources))
 
 
 def format_sources(documents: Optional[list[Document]])-> str:
@@ -155,24 +232,16 @@ def format_sources(documents: Optional[list[Document]])-> str:
     return "No sources available."
   
   # Extract unique sources
-  sources = set()
-  for document in documents:
-    source = document.metadata.get("source", "unknown")
-    sources.add(Path(source).stem)
+  sources = {_stem(document.metadata.get("source", "unknown"))
+             for document in documents}
   
   # Sort and format as markdown
-  sorted_sources = sorted(sources)
-  sources_lines = [f"- {source}" for source in sorted_sources]
-  
-  return "\n".join(sources_lines)
+  return "\n".join(f"- {source}" for source in sorted(sources))
 
 
 ############################# Structured messages #############################
 
 
-from langchain_core.messages import AnyMessage
-
-
 def get_message_text(msg: AnyMessage) -> str:
   """Get the text content of a message.
 
@@ -196,46 +265,64 @@ def get_message_text(msg: AnyMessage) -> str:
   content = msg.content
   if not content:
     return ""
-  if isinstance(content, str):
+  content_type = type(content)
+  if content_type is str:
     return content
-  if isinstance(content, dict):
+  if content_type is dict:
     return content.get("text", "")
-  c = content[0]
-  if isinstance(c, str):
-    txts = [c for c in content]
-  else: 
-    txts = [(c.get("text") or "") for c in content]
-    return "".join(txts).strip()
+
+  # Content blocks, either plain strings or dicts holding a "text" key
+  txts = []
+  append = txts.append
+  for c in content:
+    if type(c) is str:
+      append(c)
+    else:
+      append(c.get("text") or "")
+  return "".join(txts).strip()
 
 
 ############################### Remove duplicates #############################
 
 
-def remove_duplicates(base: list[str],
+def remove_duplicates(base: list[str] | set[str],
                       new: list[str]) -> list[str]:
-  base_set = set(base)
-  return [item for item in new if item not in base_set]
+  """
+  Return the items of `new` that are not in `base`, in order and without
+  repetition.
+
+  Args:
+    base: Items to exclude, a prebuilt set is used as is
+    new: Candidate items
+
+  Returns:
+    list[str]: The remaining items of `new`
+  """
+  if not base:
+    return list(dict.fromkeys(new))
+  base_set = base if isinstance(base, (set, frozenset)) else set(base)
+  return [item for item in dict.fromkeys(new) if item not in base_set]
 
 
 ############################# Make document batch #############################
 
 
 from itertools import islice
-from typing import List, TypeVar
+from typing import Iterator, List, TypeVar
 
 T = TypeVar("T")
 
 def make_batch(obj: List[T],
-               size: int = 100) -> List[List[T]]:
+               size: int = 100) -> Iterator[List[T]]:
   """
-  Split a list into batches of specified size.
+  Lazily split a list into batches of specified size.
   
   Args:
     documents: List to batch
     size: Maximum size of each batch (default: 100)
     
   Returns:
-    List of batches
+    Iterator over the batches, each one is only built when reached
     
   Raises:
     ValueError: If size is less than 1
@@ -243,21 +330,14 @@ def make_batch(obj: List[T],
   if size < 1:
     raise ValueError("Batch size must be at least 1")
   
-  if not obj:
-    return []
-  
-  # Convert to iterator for memory efficiency
+  # Use islice to create batches efficiently, stops on the first empty batch
   obj_iter = iter(obj)
-  
-  # Use islice to create batches efficiently
-  batches = []
-  while True:
-    batch = list(islice(obj_iter, size))
-    if not batch:
-      break
-    batches.append(batch)
-  
-  return batches
+  return iter(lambda: list(islice(obj_iter, size)), [])
+
+
+def count_batches(length: int, size: int = 100) -> int:
+  """Number of batches `make_batch` yields for a list of `length` items."""
+  return -(-length // size)
 
 
 ############################## Clean thinking part ############################
@@ -266,6 +346,9 @@ def make_batch(obj: List[T],
 import re
 
 
+_THINK_RE = re.compile(r'<think>(.*?)</think>', re.DOTALL | re.IGNORECASE)
+
+
 def extract_think_and_answer(text: str) -> tuple[Optional[str], str]:
   """
   Separates a string into two parts: the content within <think>...</think> tags
@@ -278,19 +361,11 @@ def extract_think_and_answer(text: str) -> tuple[Optional[str], str]:
     A tuple containing (thinking_part, answer_part).
     If no <think> tags are found, thinking_part will be an empty string.
   """
-  think_match = re.search(pattern=r'<think>(.*?)</think>',
-                          string=text,
-                          flags=re.DOTALL | re.IGNORECASE)
-
-  thinking_part = ""
-  answer_part = text
+  think_match = _THINK_RE.search(text)
 
   if think_match:
     thinking_part = think_match.group(1).strip()
-    answer_part = re.sub(pattern=r'<think>.*?</think>',
-                         repl='',
-                         string=text,
-                         flags=re.DOTALL | re.IGNORECASE).strip()
+    answer_part = _THINK_RE.sub('', text).strip()
     return thinking_part, answer_part
   return None, text
 
@@ -298,20 +373,14 @@ def extract_think_and_answer(text: str) -> tuple[Optional[str], str]:
 ############################## Ensure path exists #############################
 
 
-def ensure_path(path_str: str):
+import os
+
+
+def ensure_dir(path_str: str):
   """
-  Crée le répertoire parent si le chemin est un fichier, ou le répertoire
-  lui-même.
+  Crée le répertoire `path_str` et ses parents s'ils n'existent pas.
   """
-  from pathlib import Path
-  path = Path(path_str)
-  
-  # Si le chemin se termine par '/' ou n'a pas d'extension, c'est un dossier
-  if path_str.endswith('/') or not path.suffix:
-    path.mkdir(parents=True, exist_ok=True)
-  else:
-    # C'est un fichier, créer le répertoire parent
-    path.parent.mkdir(parents=True, exist_ok=True)
+  os.makedirs(path_str, exist_ok=True)
 
 
 ######################## Combine system and user prompt #######################